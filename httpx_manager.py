@@ -1,17 +1,33 @@
 # file: src/helpers/httpx_manager.py
+import asyncio
 import json
-from typing import Optional, Dict, Any
+import logging
+from collections import OrderedDict
+from urllib.parse import urlsplit
+from typing import Optional, Dict, Any, List, Tuple, Union
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from pydantic import BaseModel, AnyHttpUrl, Field
+import orjson
+from tenacity import AsyncRetrying, stop_after_attempt, wait_random_exponential, retry_if_exception
+from pydantic import BaseModel, AnyHttpUrl, ConfigDict, Field, field_validator
 from aiocircuitbreaker import CircuitBreaker, CircuitBreakerError
-from src.helpers.logger import Logger
+from src.helpers.logger import Logger, LoggerConfig
 from config import HTTPXMANAGER_CONFIG
 
+# Module-level logger shared by every HTTPXMANAGER instance
+_log = logging.getLogger("HTTPXMANAGER")
+
+ALLOWED_METHODS = frozenset({"GET", "POST", "PUT", "DELETE"})
+
+# Requests carrying these headers bypass the conditional-GET cache: credentials would let
+# one caller's cached body be served to another, and explicit validators are the caller's own
+_UNCACHEABLE_REQUEST_HEADERS = frozenset({"authorization", "cookie", "if-none-match", "if-modified-since"})
+
 # ----------------------------
 # Pydantic Models
 # ----------------------------
 class RequestPayload(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     url: AnyHttpUrl
     method: str = Field(default="GET", pattern="^(GET|POST|PUT|DELETE)$")
     body: Optional[dict] = None
@@ -19,6 +35,12 @@ class RequestPayload(BaseModel):
     timeout: Optional[float] = None
     follow_redirects: bool = True
 
+    @field_validator('method', mode='before')
+    @classmethod
+    def normalize_method(cls, v: Any) -> Any:
+        # Uppercase once here so the request path never has to
+        return v.upper() if isinstance(v, str) else v
+
 class ResponsePayload(BaseModel):
     success: bool
     data: Optional[Any] = None
@@ -28,8 +50,18 @@ class ResponsePayload(BaseModel):
 # ----------------------------
 # Retry filter
 # ----------------------------
+_RETRY_EXC = (httpx.TimeoutException, httpx.NetworkError, CircuitBreakerError)
+# Concrete types actually raised by httpx - an exact type hit skips the isinstance MRO walk
+_RETRY_EXACT = frozenset({
+    httpx.ConnectTimeout, httpx.ReadTimeout, httpx.WriteTimeout, httpx.PoolTimeout,
+    httpx.ConnectError, httpx.ReadError, httpx.WriteError, httpx.CloseError,
+    CircuitBreakerError
+})
+
 def _should_retry(exception: Exception) -> bool:
-    if isinstance(exception, (httpx.TimeoutException, httpx.NetworkError, CircuitBreakerError)):
+    if type(exception) in _RETRY_EXACT:
+        return True
+    if isinstance(exception, _RETRY_EXC):
         return True
     if isinstance(exception, httpx.HTTPStatusError):
         return exception.response.status_code >= 500 or exception.response.status_code == 429
@@ -40,7 +72,14 @@ def _should_retry(exception: Exception) -> bool:
 # ----------------------------
 class HTTPXMANAGER:
     def __init__(self):
-        self.logger = Logger().create_logger(logging_level=HTTPXMANAGER_CONFIG[__class__.__name__])
+        # Attach handlers once per process; later instances only adjust the level
+        logging_level = HTTPXMANAGER_CONFIG[__class__.__name__]
+        if not _log.handlers:
+            Logger().setup_logger(
+                config=LoggerConfig(LOG_LEVEL=logging_level, LOG_FILE=f"logs/{_log.name}.log"),
+                logger_name=_log.name
+            )
+        _log.setLevel(logging_level.upper())
         self.timeout = HTTPXMANAGER_CONFIG['TIMEOUT']
 
         # Circuit breaker configuration
@@ -53,93 +92,267 @@ class HTTPXMANAGER:
         self.retry_min_wait = HTTPXMANAGER_CONFIG.get('RETRY_MIN_WAIT', 1)
         self.retry_max_wait = HTTPXMANAGER_CONFIG.get('RETRY_MAX_WAIT', 10)
 
-        # Circuit breaker
-        self.circuit_breaker = CircuitBreaker(
+        # Connection pool configuration
+        self.max_connections = HTTPXMANAGER_CONFIG.get('MAX_CONNECTIONS', 1000)
+        self.max_keepalive_connections = HTTPXMANAGER_CONFIG.get('MAX_KEEPALIVE_CONNECTIONS', 100)
+        self.keepalive_expiry = HTTPXMANAGER_CONFIG.get('KEEPALIVE_EXPIRY', 15.0)
+        self.http2 = HTTPXMANAGER_CONFIG.get('HTTP2', True)
+
+        # Concurrency cap per host - keep <= MAX_CONNECTIONS so bursts queue here instead of inside the pool
+        self.max_in_flight = HTTPXMANAGER_CONFIG.get('MAX_IN_FLIGHT', 200)
+
+        # Conditional-GET cache: url -> (etag, last_modified, raw body, encoding), LRU-bounded.
+        # Raw bytes are kept (not the parsed result) so every caller gets its own fresh object.
+        self.etag_cache_size = HTTPXMANAGER_CONFIG.get('ETAG_CACHE_SIZE', 256)
+        self._etag_cache: "OrderedDict[str, Tuple[Optional[str], Optional[str], bytes, Optional[str]]]" = OrderedDict()
+
+        # Per-host shards (client, circuit breaker, semaphore), built lazily on first use
+        # so one slow or failing host can't open the breaker or exhaust the pool for the others
+        self._per_host: Dict[str, Dict[str, Any]] = {}
+
+        # Retry policy built from instance config - a template, copied per request.
+        # Full jitter (random(0, 2^n * multiplier)) so clients don't retry in lockstep after an outage
+        self._retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.retry_attempts),
+            wait=wait_random_exponential(multiplier=self.retry_multiplier, max=self.retry_max_wait),
+            retry=retry_if_exception(_should_retry),
+            reraise=True
+        )
+
+    def _build_shard(self, host: str) -> Dict[str, Any]:
+        """Create the client, circuit breaker and semaphore used for a single host."""
+        # Pooled client - reuses connections instead of a new TCP/TLS handshake per request.
+        # With HTTP/2 (negotiated via ALPN) concurrent requests to the host multiplex as streams
+        # over a single connection, so a small keep-alive pool serves many in-flight calls.
+        client = httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            headers={"Content-Type": "application/json"}
+        )
+        breaker = CircuitBreaker(
             failure_threshold=self.circuit_failure_threshold,
             recovery_timeout=self.circuit_recovery_timeout,
             expected_exception=(httpx.TimeoutException, httpx.RequestError, httpx.HTTPStatusError),
-            name="HTTPXManagerCircuitBreaker"
+            name=f"HTTPXManagerCircuitBreaker[{host}]"
         )
+        return {
+            "client": client,
+            "breaker": breaker,
+            "sem": asyncio.Semaphore(self.max_in_flight),
+            # Decorate once instead of building a new wrapper on every request
+            "execute": breaker.decorate(self._execute_request),
+        }
+
+    def _get_shard(self, url: str) -> Dict[str, Any]:
+        host = urlsplit(url).netloc
+        shard = self._per_host.get(host)
+        if shard is None:
+            shard = self._per_host[host] = self._build_shard(host)
+        return shard
+
+    async def aclose(self):
+        """Close all per-host clients and release pooled connections."""
+        shards = list(self._per_host.values())
+        self._per_host.clear()
+        for shard in shards:
+            await shard["client"].aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type((
-            httpx.TimeoutException,
-            httpx.NetworkError,
-            CircuitBreakerError,
-            httpx.HTTPStatusError
-        )),
-        reraise=True
-    )
     async def make_request(self, payload: RequestPayload) -> Dict[str, Any]:
         """Accepts a RequestPayload Pydantic model for GET/POST/PUT/DELETE requests."""
+        return await self._make_request_raw(str(payload.url), payload.method, payload.body, payload.headers,
+                                            payload.timeout, payload.follow_redirects)
+
+    async def make_requests(self, payloads: List[RequestPayload]) -> List[Union[Dict[str, Any], BaseException]]:
+        """Run many requests concurrently over the pooled clients, results in payload order.
+
+        Concurrency per host is bounded by MAX_IN_FLIGHT; exceptions are returned in place
+        instead of cancelling the rest of the batch.
+        """
+        return await asyncio.gather(*(self.make_request(p) for p in payloads), return_exceptions=True)
+
+    async def _make_request_raw(self, url: str, method: str, body: Optional[dict] = None,
+                                headers: Optional[dict] = None, timeout: Optional[float] = None,
+                                follow_redirects: bool = True) -> Dict[str, Any]:
+        """Fast path for trusted internal callers - skips RequestPayload validation.
 
-        # Ensure url is str for httpx
-        url = str(payload.url)
-        method = payload.method.upper()
-        body = payload.body
-        headers = payload.headers
-        timeout = payload.timeout or self.timeout
-        follow_redirects = payload.follow_redirects
+        `url` must already be a valid absolute URL string; only the method is checked.
+        """
+        if method not in ALLOWED_METHODS:
+            method = method.upper()
+            if method not in ALLOWED_METHODS:
+                raise ValueError(f"Unsupported method: {method}. Must be one of {sorted(ALLOWED_METHODS)}")
 
+        shard = self._get_shard(url)
+
+        # Fail fast while the host's breaker is open - don't enter the retry machinery at all.
+        # The CircuitBreakerError handler below still covers a breaker that opens mid-call.
+        if shard["breaker"].opened:
+            _log.warning("Circuit breaker open: %s", url)
+            return {"error": "CIRCUIT_BREAKER_OPEN", "message": "Service temporarily unavailable"}
+
+        # Only override the client's timeout when the caller explicitly set one
+        if timeout is None:
+            timeout = httpx.USE_CLIENT_DEFAULT
+
+        # AsyncRetrying keeps statistics and iteration state on the instance, so each request
+        # runs on its own copy of the policy (as tenacity's decorator does)
+        try:
+            return await self._retrying.copy()(self._call_with_breaker, shard, url, method, body, headers, timeout,
+                                               follow_redirects)
+        except httpx.HTTPStatusError as e:
+            # Client errors (incl. a 429 that outlasted its retries) are reported, not raised
+            if e.response.status_code < 500:
+                return {"error": f"HTTP_{e.response.status_code}", "message": str(e)}
+            raise
+
+    async def _call_with_breaker(self, shard: Dict[str, Any], url: str, method: str, body: Optional[dict],
+                                 headers: Optional[dict], timeout: Any, follow_redirects: bool = True) -> Dict[str, Any]:
+        """Single attempt of a request, guarded by the host's circuit breaker."""
         # Use circuit breaker to wrap actual request
         try:
-            decorated_execute = self.circuit_breaker.decorate(self._execute_request)
-            return await decorated_execute(url, method, body, headers, timeout, follow_redirects)
+            async with shard["sem"]:
+                return await shard["execute"](shard["client"], url, method, body, headers, timeout,
+                                              follow_redirects)
         except CircuitBreakerError as e:
-            self.logger.warning(f"Circuit breaker open: {url} - {e}")
+            _log.warning("Circuit breaker open: %s - %s", url, e)
             return {"error": "CIRCUIT_BREAKER_OPEN", "message": "Service temporarily unavailable"}
-        except Exception as e:
-            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500:
-                return {"error": f"HTTP_{e.response.status_code}", "message": str(e)}
-            raise
 
-    async def _execute_request(self, url: str, method: str, body: Optional[dict],
-                               headers: Optional[dict], timeout: float, follow_redirects: bool = True) -> Dict[str, Any]:
+    async def _execute_request(self, client: httpx.AsyncClient, url: str, method: str, body: Optional[dict],
+                               headers: Optional[dict], timeout: Any, follow_redirects: bool = True) -> Dict[str, Any]:
         """Actual HTTP request execution."""
-        self.logger.debug(f"Making {method} request to {url}")
-        self.logger.debug(f"Request body: {body}")
+        # %-style args so large bodies are only stringified when DEBUG is actually enabled
+        _log.debug("Making %s request to %s", method, url)
+        _log.debug("Request body: %r", body)
 
-        headers = headers or {"Content-Type": "application/json"}
+        # Revalidate cached GETs instead of re-downloading unchanged bodies
+        use_cache = (method == "GET" and self.etag_cache_size
+                     and not (headers and any(k.lower() in _UNCACHEABLE_REQUEST_HEADERS for k in headers)))
+        cached = self._etag_cache.get(url) if use_cache else None
+        if cached is not None:
+            etag, last_modified = cached[0], cached[1]
+            headers = dict(headers) if headers else {}
+            if etag:
+                headers.setdefault("If-None-Match", etag)
+            if last_modified:
+                headers.setdefault("If-Modified-Since", last_modified)
 
         try:
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=follow_redirects) as client:
-                resp = await client.request(method, url, json=body, headers=headers)
+            # Encode with orjson ourselves; Content-Type comes from the client default headers,
+            # caller headers (None by default) are merged on top of them by httpx
+            content = self._encode_body(body) if body is not None else None
+            # Stream and read the (transparently decompressed) body once
+            async with client.stream(method, url, content=content, headers=headers,
+                                     timeout=timeout, follow_redirects=follow_redirects) as resp:
+                if cached is not None and resp.status_code == 304:
+                    _log.debug("Not modified, serving cached response: %s", url)
+                    self._etag_cache.move_to_end(url)
+                    # Drain the (empty) 304 body so the connection goes back to the pool
+                    await resp.aread()
+                    # Re-parse the cached bytes - still no download, and no shared mutable result
+                    return self._decode_body(cached[2], cached[3], 200)
+                raw = await resp.aread()
+                # Body is read first so callers can still inspect e.response.text / .json()
                 resp.raise_for_status()
-                try:
-                    return resp.json()
-                except json.JSONDecodeError:
-                    return {"text": resp.text, "status_code": resp.status_code}
-        except Exception as e:
-            self.logger.error(f"Unexpected error: {e}")
+            if use_cache and resp.status_code == 200:
+                self._cache_validators(url, resp, raw)
+            return self._decode_body(raw, resp.encoding, resp.status_code)
+        except httpx.HTTPError as e:
+            # Single log per failed attempt; the exception (with its traceback) goes to the caller
+            _log.error("%s %s failed: %s", method, url, e)
             raise
 
+    @staticmethod
+    def _encode_body(body: Any) -> bytes:
+        """Encode a JSON body with orjson, accepting (and rejecting) what httpx's json= did."""
+        try:
+            # Non-str keys (e.g. ints) are stringified like stdlib json does
+            encoded = orjson.dumps(body, option=orjson.OPT_NON_STR_KEYS)
+            # orjson writes NaN/Infinity as null; only bodies containing a null need the
+            # stdlib re-check, which raises ValueError for non-finite floats like json= did
+            if b"null" not in encoded:
+                return encoded
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits - let stdlib json handle the rare leftovers
+            pass
+        return json.dumps(body, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+    @staticmethod
+    def _decode_body(raw: bytes, encoding: Optional[str], status_code: int) -> Any:
+        """Parse a JSON body, falling back to text like the response would."""
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return {"text": raw.decode(encoding or "utf-8", errors="replace"), "status_code": status_code}
+
+    def _cache_validators(self, url: str, resp: httpx.Response, raw: bytes):
+        """Remember ETag / Last-Modified for a GET so the next one can be conditional."""
+        if not self.etag_cache_size:
+            return
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        cache_control = {d.split("=", 1)[0].strip() for d in resp.headers.get("Cache-Control", "").lower().split(",")}
+        # Entries are keyed by URL only, so anything varying on request headers (other than the
+        # Accept-Encoding the client always sends) can't be stored safely
+        vary = {v.strip() for v in resp.headers.get("Vary", "").lower().split(",") if v.strip()}
+        if (not etag and not last_modified) or "no-store" in cache_control or "private" in cache_control \
+                or vary - {"accept-encoding"}:
+            self._etag_cache.pop(url, None)
+            return
+        self._etag_cache[url] = (etag, last_modified, raw, resp.encoding)
+        self._etag_cache.move_to_end(url)
+        while len(self._etag_cache) > self.etag_cache_size:
+            self._etag_cache.popitem(last=False)
+
 # ----------------------------
 # Example usage
 # ----------------------------
 if __name__ == "__main__":
-    import asyncio
-
     async def example_usage():
-        http_manager = HTTPXMANAGER()
+        async with HTTPXMANAGER() as http_manager:
 
-        # --- GET example ---
-        get_payload = RequestPayload(
-            url="https://jsonplaceholder.typicode.com/posts/1",
-            method="GET"
-        )
-        get_result = await http_manager.make_request(get_payload)
-        print("GET result:", json.dumps(get_result, indent=2))
-
-        # --- POST example ---
-        post_payload = RequestPayload(
-            url="https://jsonplaceholder.typicode.com/posts",
-            method="POST",
-            body={"title": "foo", "body": "bar", "userId": 1},
-            headers={"Content-Type": "application/json"}
-        )
-        post_result = await http_manager.make_request(post_payload)
-        print("POST result:", json.dumps(post_result, indent=2))
+            # --- GET example ---
+            get_payload = RequestPayload(
+                url="https://jsonplaceholder.typicode.com/posts/1",
+                method="GET"
+            )
+            get_result = await http_manager.make_request(get_payload)
+            print("GET result:", json.dumps(get_result, indent=2))
+
+            # --- POST example ---
+            post_payload = RequestPayload(
+                url="https://jsonplaceholder.typicode.com/posts",
+                method="POST",
+                body={"title": "foo", "body": "bar", "userId": 1},
+                headers={"Content-Type": "application/json"}
+            )
+            post_result = await http_manager.make_request(post_payload)
+            print("POST result:", json.dumps(post_result, indent=2))
+
+            # --- Batch example ---
+            batch_payloads = [
+                RequestPayload(url=f"https://jsonplaceholder.typicode.com/posts/{i}", method="GET")
+                for i in range(1, 6)
+            ]
+            batch_results = await http_manager.make_requests(batch_payloads)
+            print("Batch results:", [r.get("id") if isinstance(r, dict) else repr(r) for r in batch_results])
+
+    # uvloop is optional; fall back to the default event loop when it isn't installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
 
     asyncio.run(example_usage())
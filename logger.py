@@ -1,32 +1,67 @@
 #file:src/logger.py
 
+import atexit
+import copy
 import json
 import logging
 import logging.handlers
 import os
-import inspect
-from datetime import datetime
+import queue
+import sys
+import time
 from pathlib import Path
 from colorlog import ColoredFormatter
 from pydantic import Field, field_validator, ValidationError, BaseModel
-from typing import Optional
+from typing import ClassVar, Optional
+
+# Resolved once at import instead of on every validator / setup call
+_MODULE_DIR = Path(__file__).resolve().parent
+_PROJECT_ROOT = _MODULE_DIR.parent
+_REPO_ROOT = _PROJECT_ROOT.parent
+
+# Directories already created in this process - skips repeated makedirs/stat calls
+_ENSURED_DIRS = set()
+
+
+def _ensure_dir(path) -> None:
+    """os.makedirs(path, exist_ok=True), at most once per directory per process"""
+    path = os.fspath(path)
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+
+# orjson is optional - fall back to stdlib json so the module stays importable without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj, indent: Optional[int] = None) -> str:
+    """Serialize to JSON - compact single line when indent is None"""
+    if orjson is not None and indent in (None, 2):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+    return json.dumps(obj, indent=indent, separators=(',', ':') if indent is None else None)
 
 
 class LoggerConfig(BaseModel):
+    _VALID_LEVELS: ClassVar[frozenset] = frozenset({'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'})
+
     LOG_LEVEL: str = Field(default="INFO")
     LOG_FILE: Optional[str] = Field(default=None)
     ENABLE_SEVERITY_FILES: bool = Field(default=True)
-    SEVERITY_FILES_DIR: str = Field(default="logs/severity")
+    SEVERITY_FILES_DIR: str = Field(default="logs/severity", validate_default=True)
     MAX_LOG_SIZE_MB: int = Field(default=10)
     BACKUP_COUNT: int = Field(default=5)
+    BUFFER_CAPACITY: int = Field(default=512)
 
     @field_validator('LOG_LEVEL')
     @classmethod
     def validate_log_level(cls, v: str) -> str:
-        valid_levels = {'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'}
         v_upper = v.upper()
-        if v_upper not in valid_levels:
-            raise ValueError(f'Invalid LOG_LEVEL: {v}. Must be one of {valid_levels}')
+        if v_upper not in cls._VALID_LEVELS:
+            raise ValueError(f'Invalid LOG_LEVEL: {v}. Must be one of {sorted(cls._VALID_LEVELS)}')
         return v_upper
 
     @field_validator('LOG_FILE')
@@ -36,12 +71,11 @@ class LoggerConfig(BaseModel):
             return None
         v = v.strip()
         if not os.path.isabs(v):
-            project_root = Path(__file__).parent.parent.absolute()
-            v = str(project_root / v)
-        if not Path(v).suffix:
+            v = str(_PROJECT_ROOT / v)
+        if not os.path.splitext(v)[1]:
             v = f"{v}.log"
         log_dir = os.path.dirname(v)
-        os.makedirs(log_dir, exist_ok=True)
+        _ensure_dir(log_dir)
         return v
 
     @field_validator('SEVERITY_FILES_DIR')
@@ -49,8 +83,7 @@ class LoggerConfig(BaseModel):
     def validate_severity_dir(cls, v: str) -> str:
         v = v.strip()
         if not os.path.isabs(v):
-            project_root = Path(__file__).parent.parent.absolute()
-            v = str(project_root / v)
+            v = str(_PROJECT_ROOT / v)
         return v
 
     @field_validator('MAX_LOG_SIZE_MB')
@@ -67,24 +100,139 @@ class LoggerConfig(BaseModel):
             raise ValueError("BACKUP_COUNT must be between 0 and 50")
         return v
 
-class SeverityFilter(logging.Filter):
-    """Filter to only allow specific log levels"""
+    @field_validator('BUFFER_CAPACITY')
+    @classmethod
+    def validate_buffer_capacity(cls, v: int) -> int:
+        if v <= 0 or v > 10000:
+            raise ValueError("BUFFER_CAPACITY must be between 1 and 10000")
+        return v
+
+# Known-good fallback, built without re-running validation (values are already in validated form)
+_DEFAULT_FALLBACK_CONFIG = LoggerConfig.model_construct(
+    LOG_LEVEL="INFO",
+    LOG_FILE=None,
+    ENABLE_SEVERITY_FILES=False,
+    SEVERITY_FILES_DIR=str(_PROJECT_ROOT / "logs" / "severity"),
+    MAX_LOG_SIZE_MB=10,
+    BACKUP_COUNT=5,
+    BUFFER_CAPACITY=512
+)
+
+
+class BufferedHandler(logging.handlers.MemoryHandler):
+    """Batch records in memory and write them to a file handler in bulk.
+
+    Flushes when the buffer is full, on ERROR and above, and on close; the
+    FlushingQueueListener also flushes it whenever the queue goes idle. Copies the
+    target's level and filters so only records the target would write are buffered,
+    and closes the target along with itself.
+    """
+
+    def __init__(self, target, capacity=512):
+        super().__init__(capacity, flushLevel=logging.ERROR, target=target, flushOnClose=True)
+        self.setLevel(target.level)
+        for f in target.filters:
+            self.addFilter(f)
+
+    def close(self):
+        target = self.target
+        super().close()
+        if target:
+            target.close()
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps exc_info so file formatters can still build JSON error context
+
+    Each configured logger gets its own instance, which stamps the logger's route key on
+    the record - records propagated up from child loggers (e.g. "a.child") still reach
+    the owning logger's LOG_FILE.
+    """
+
+    def __init__(self, queue, route):
+        super().__init__(queue)
+        self.route = route
+
+    def prepare(self, record):
+        # The queue is in-process, so traceback objects can travel with the record;
+        # only merge args now so later mutation of them can't change the message
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record._route = self.route
+        return record
+
+
+class RoutingHandler(logging.Handler):
+    """Runs on the QueueListener thread and dispatches each record to its logger's file handlers"""
 
-    def __init__(self, level):
+    def __init__(self):
         super().__init__()
-        self.level = level
+        self.routes = {}  # route key (configured logger name) -> per-logger handlers (LOG_FILE)
+        self.shared = []  # handlers every logger writes to (complete log, severity files)
 
-    def filter(self, record):
-        return record.levelno == self.level
+    def handle(self, record):
+        for handler in (*self.shared, *self.routes.get(getattr(record, '_route', record.name), ())):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+    def emit(self, record):
+        self.handle(record)
+
+    def flush(self):
+        for handler in (*self.shared, *(h for handlers in list(self.routes.values()) for h in handlers)):
+            handler.flush()
+
+
+class FlushingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes buffered handlers once the queue is drained
+
+    Buffers only batch writes during a burst: they are flushed as soon as the queue
+    is empty, and at least every flush_interval seconds under sustained load.
+    """
+
+    def __init__(self, queue, router, flush_interval=1.0):
+        super().__init__(queue, router)
+        self._router = router
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def handle(self, record):
+        super().handle(record)
+        now = time.monotonic()
+        if self.queue.empty() or now - self._last_flush >= self.flush_interval:
+            self._router.flush()
+            self._last_flush = now
 
 
 class JsonFormatter(logging.Formatter):
-    """Custom formatter that outputs JSON for ERROR and CRITICAL levels"""
+    """Custom formatter that outputs JSON for ERROR and CRITICAL levels
+
+    indent=None (the default) writes compact single-line JSON for files; pass indent=2
+    for human-readable output.
+    """
+
+    def __init__(self, *args, indent: Optional[int] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._indent = indent
+        # Per-record cache key, so compact and indented output can be cached side by side
+        self._cache_attr = f"_json_formatted_{indent}"
 
     def format(self, record):
         # Only format as JSON for ERROR and CRITICAL levels
         if record.levelno == logging.ERROR:
+            # The same ERROR record reaches several handlers (console, LOG_FILE, complete log,
+            # error.log) - build the JSON context once per record and reuse it
+            formatted = getattr(record, self._cache_attr, None)
+            if formatted is not None:
+                return formatted
             try:
+                # record.created is captured once by logging - no extra clock read per handler
+                timestamp = self.formatTime(record, '%Y-%m-%d %H:%M:%S')
+                levelname = record.levelname
+                name = record.name
+                message = record.getMessage()
                 exc_info = record.exc_info
 
                 if exc_info:
@@ -103,29 +251,34 @@ class JsonFormatter(logging.Formatter):
                     else:
                         filename = lineno = function = "unknown"
 
+                    # Memoize the traceback on the record the same way logging.Formatter does,
+                    # so every handler and JSON variant shares one formatted string
+                    if not record.exc_text:
+                        record.exc_text = self.formatException(exc_info)
+
                     # Build JSON context
-                    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                     error_context = {
                         "error_type": exc_type.__name__ if exc_type else "Unknown",
                         "error_message": str(exc_value),
                         "file": filename,
                         "line": lineno,
                         "function": function,
-                        "traceback": self.formatException(exc_info),
+                        "traceback": record.exc_text,
                         "timestamp": timestamp,
-                        "level": record.levelname,
-                        "logger": record.name,
-                        "message": record.getMessage()
+                        "level": levelname,
+                        "logger": name,
+                        "message": message
                     }
 
-                    json_output = json.dumps(error_context, indent=2)
-                    return f"{timestamp} - [{record.name}] {record.levelname}:\n{json_output}"
+                    json_output = _dumps(error_context, self._indent)
+                    separator = "\n" if self._indent else " "
+                    formatted = f"{timestamp} - [{name}] {levelname}:{separator}{json_output}"
                 else:
-                    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-                    return  f"{timestamp} - [{record.name}] {record.levelname} -  {record.getMessage()}"
-            except:
-                # Fallback to normal formatting if JSON fails
+                    formatted = f"{timestamp} - [{name}] {levelname} -  {message}"
+                setattr(record, self._cache_attr, formatted)
+                return formatted
+            except (AttributeError, TypeError, ValueError):
+                # Fallback to normal formatting if JSON fails (bad message args, unserializable values)
                 return super().format(record)
 
         # For non-error levels, use normal formatting
@@ -151,11 +304,89 @@ class ColoredJsonFormatter(JsonFormatter):
         return formatted_message
 
 
+class FastPlainFormatter(logging.Formatter):
+    """Plain line format built with an f-string instead of %-style substitution
+
+    Same output as '%(asctime)s - %(levelname)s [%(name)s.%(funcName)s()] - %(message)s'.
+    """
+
+    def format(self, record):
+        line = (f"{self.formatTime(record, self.datefmt)} - {record.levelname} "
+                f"[{record.name}.{record.funcName}()] - {record.getMessage()}")
+        # Keep stdlib behaviour for tracebacks / stack info on non-JSON records
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line = f"{line}\n{record.exc_text}"
+        if record.stack_info:
+            line = f"{line}\n{self.formatStack(record.stack_info)}"
+        return line
+
+
+class FastDispatchFormatter(logging.Formatter):
+    """Pick the formatter for a record with a single dict lookup on its level"""
+
+    def __init__(self, by_level, default_formatter):
+        super().__init__()
+        # Store bound format methods so dispatch is one lookup + one call per record
+        self._by_level = {level: formatter.format for level, formatter in by_level.items()}
+        self._default = default_formatter.format
+
+    def format(self, record):
+        return self._by_level.get(record.levelno, self._default)(record)
+
+
 class Logger:
     def __init__(self):
         self._logger_instances = {}  # Global logger registry to prevent duplicates
         self._complete_log_handler = None  # Single complete log handler instance
         self._severity_handlers = {}  # Shared severity handlers
+        self._verified_dirs = set()  # Severity directories already created and checked for write access
+
+        # Formatters are stateless - build them once and share them across every logger
+        normal_formatter = FastPlainFormatter(datefmt='%Y-%m-%d %H:%M:%S')
+        color_formatter = ColoredFormatter(
+            '%(log_color)s%(asctime)s - %(levelname)s [%(name)s.%(funcName)s()] - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S',
+            log_colors={
+                'DEBUG': 'cyan',
+                'INFO': 'green',
+                'WARNING': 'yellow',
+                'ERROR': 'red',
+                'CRITICAL': 'bold_red',
+            }
+        )
+        # For console, use colored JSON for errors and normal color for others
+        self._console_formatter = FastDispatchFormatter({logging.ERROR: ColoredJsonFormatter(indent=2)}, color_formatter)
+        # For files, use single-line JSON for ERROR/CRITICAL and normal format for others
+        json_formatter = JsonFormatter()
+        self._file_formatter = FastDispatchFormatter(
+            {logging.ERROR: json_formatter, logging.CRITICAL: json_formatter}, normal_formatter
+        )
+        self._severity_formatter = JsonFormatter(
+            '%(asctime)s - [%(name)s] %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+
+        # File I/O runs off the caller's thread: loggers only enqueue records (one
+        # RecordQueueHandler each), a single listener thread routes them to the file handlers
+        self._queue = queue.SimpleQueue()
+        self._router = RoutingHandler()
+        self._listener = None
+
+    def _start_listener(self):
+        """Start the background listener thread on first use"""
+        if self._listener is None:
+            self._listener = FlushingQueueListener(self._queue, self._router)
+            self._listener.start()
+            atexit.register(self._stop_listener)
+
+    def _stop_listener(self):
+        """Drain the queue and stop the listener thread"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+            atexit.unregister(self._stop_listener)
 
     def _setup_severity_handlers(self, config: LoggerConfig):
         """Setup shared severity-specific file handlers"""
@@ -169,42 +400,31 @@ class Logger:
         }
 
         try:
-            # Ensure severity directory exists
-            os.makedirs(config.SEVERITY_FILES_DIR, exist_ok=True)
-
-            # Test write permissions
-            test_file = os.path.join(config.SEVERITY_FILES_DIR, '.write_test')
-            with open(test_file, 'w') as f:
-                f.write('test')
-            os.remove(test_file)
-
-            # Create JSON formatter for severity files
-            json_formatter = JsonFormatter(
-                '%(asctime)s - [%(name)s] %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
+            # Ensure severity directory exists and is writable - checked once per directory
+            if config.SEVERITY_FILES_DIR not in self._verified_dirs:
+                _ensure_dir(config.SEVERITY_FILES_DIR)
+                if not os.access(config.SEVERITY_FILES_DIR, os.W_OK):
+                    raise PermissionError(f"Severity log directory is not writable: {config.SEVERITY_FILES_DIR}")
+                self._verified_dirs.add(config.SEVERITY_FILES_DIR)
 
             for level_name, level_value in severity_levels.items():
-                # get root (project dir with server.py)
-                ROOT_DIR = Path(__file__).resolve().parent.parent.parent
-
-                # put severity logs under logs/
-                SEVERITY_FILES_DIR = ROOT_DIR / "logs"
-
-                log_file_path = os.path.join(SEVERITY_FILES_DIR, f"{level_name.lower()}.log")
+                # put severity logs under the configured SEVERITY_FILES_DIR (checked above)
+                log_file_path = os.path.join(config.SEVERITY_FILES_DIR, f"{level_name.lower()}.log")
 
                 handler = logging.handlers.RotatingFileHandler(
                     log_file_path,
                     mode='a',
                     maxBytes=config.MAX_LOG_SIZE_MB * 1024 * 1024,
                     backupCount=config.BACKUP_COUNT,
-                    encoding='utf-8'
+                    encoding='utf-8',
+                    delay=True  # open the file on first emit, not at setup
                 )
-                handler.setFormatter(json_formatter)
+                handler.setFormatter(self._severity_formatter)
                 handler.setLevel(level_value)
-                handler.addFilter(SeverityFilter(level_value))
+                # Only allow this exact level - logging accepts a plain callable as a filter
+                handler.addFilter(lambda record, _level=level_value: record.levelno == _level)
 
-                self._severity_handlers[level_name] = handler
+                self._severity_handlers[level_name] = BufferedHandler(handler, config.BUFFER_CAPACITY)
 
         except Exception as e:
             print(f"⚠️  Warning: Could not set up severity-specific log files: {e}")
@@ -225,12 +445,7 @@ class Logger:
                 for error in e.errors():
                     print(f"  - {error['loc'][0]}: {error['msg']}")
                 # Fall back to basic config
-                config = LoggerConfig(
-                    LOG_LEVEL="INFO",
-                    LOG_FILE=None,
-                    ENABLE_SEVERITY_FILES=False
-                )
-                return None
+                config = _DEFAULT_FALLBACK_CONFIG
 
         # Setup shared handlers
         self._setup_severity_handlers(config)
@@ -238,57 +453,27 @@ class Logger:
         # Main application logger
         logger = logging.getLogger(logger_name)
 
-        # Clear existing handlers to prevent duplication
+        # Already configured by a Logger (e.g. another instance) - reuse it instead of rebuilding handlers
+        if any(getattr(h, '_httpx_marker', False) for h in logger.handlers):
+            self._logger_instances[logger_name] = logger
+            return logger
+
+        # Clear foreign handlers to prevent duplication
         logger.handlers.clear()
         logger.propagate = False
 
-        # Set log level
-        level_mapping = {
-            'DEBUG': logging.DEBUG,
-            'INFO': logging.INFO,
-            'WARNING': logging.WARNING,
-            'ERROR': logging.ERROR,
-            'CRITICAL': logging.CRITICAL
-        }
-        logger.setLevel(level_mapping[config.LOG_LEVEL])
-
-        # Normal formatter
-        normal_formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s [%(name)s.%(funcName)s()] - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-
-        # Color formatter
-        color_formatter = ColoredFormatter(
-            '%(log_color)s%(asctime)s - %(levelname)s [%(name)s.%(funcName)s()] - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S',
-            log_colors={
-                'DEBUG': 'cyan',
-                'INFO': 'green',
-                'WARNING': 'yellow',
-                'ERROR': 'red',
-                'CRITICAL': 'bold_red',
-            }
-        )
-        json_formatter = JsonFormatter()
-        colored_json_formatter = ColoredJsonFormatter()
+        # Set log level - LOG_LEVEL is already validated and uppercased, setLevel accepts the name
+        logger.setLevel(config.LOG_LEVEL)
 
         # Console handler - use colored formatter for all levels
         console_handler = logging.StreamHandler()
-
-        # For console, use colored JSON for errors and normal color for others
-        class ConsoleLevelAwareFormatter(logging.Formatter):
-            def format(self, record):
-                if record.levelno == logging.ERROR:
-
-                    return colored_json_formatter.format(record)
-                else:
-
-                    return color_formatter.format(record)
-
-        console_handler.setFormatter(ConsoleLevelAwareFormatter())
+        console_handler.setFormatter(self._console_formatter)
+        console_handler._httpx_marker = True
         logger.addHandler(console_handler)
 
+        # File handlers are attached to the listener's router, not to the logger
+        file_handlers = []
+
         # File handler for specific logger (if specified)
         if config.LOG_FILE:
             try:
@@ -297,19 +482,11 @@ class Logger:
                     mode='a',
                     maxBytes=config.MAX_LOG_SIZE_MB * 1024 * 1024,
                     backupCount=config.BACKUP_COUNT,
-                    encoding='utf-8'
+                    encoding='utf-8',
+                    delay=True  # open the file on first emit, not at setup
                 )
-
-                # For files, use JSON for errors and normal format for others
-                class FileLevelAwareFormatter(logging.Formatter):
-                    def format(self, record):
-                        if record.levelno >= logging.ERROR:
-                            return json_formatter.format(record)
-                        else:
-                            return normal_formatter.format(record)
-
-                file_handler.setFormatter(FileLevelAwareFormatter())
-                logger.addHandler(file_handler)
+                file_handler.setFormatter(self._file_formatter)
+                file_handlers.append(BufferedHandler(file_handler, config.BUFFER_CAPACITY))
             except Exception as e:
                 print(f"⚠️  Error: Could not set up file logging: {e}")
                 logger.warning(f"File logging disabled due to error: {e}")
@@ -317,40 +494,36 @@ class Logger:
         # Add complete log handler (shared across all loggers)
         if self._complete_log_handler is None:
             try:
-                file_path = Path(__file__).resolve().parent.parent.parent
-                complete_log_path = f"{file_path}/logs/complete_log.log"
+                complete_log_path = f"{_REPO_ROOT}/logs/complete_log.log"
 
                 # Ensure directory exists
-                os.makedirs(os.path.dirname(complete_log_path), exist_ok=True)
+                _ensure_dir(os.path.dirname(complete_log_path))
 
-                self._complete_log_handler = logging.handlers.RotatingFileHandler(
+                complete_file_handler = logging.handlers.RotatingFileHandler(
                     complete_log_path,
                     mode='a',
                     maxBytes=config.MAX_LOG_SIZE_MB * 1024 * 1024,
                     backupCount=config.BACKUP_COUNT,
-                    encoding='utf-8'
+                    encoding='utf-8',
+                    delay=True  # open the file on first emit, not at setup
                 )
 
                 # For complete log, use JSON for errors and normal format for others
-                class CompleteLogLevelAwareFormatter(logging.Formatter):
-                    def format(self, record):
-                        if record.levelno >= logging.ERROR:
-                            return json_formatter.format(record)
-                        else:
-                            return normal_formatter.format(record)
-
-                self._complete_log_handler.setFormatter(CompleteLogLevelAwareFormatter())
+                complete_file_handler.setFormatter(self._file_formatter)
+                self._complete_log_handler = BufferedHandler(complete_file_handler, config.BUFFER_CAPACITY)
             except Exception as e:
                 print(f"⚠️  Error: Could not set up complete log: {e}")
                 # Don't add handler if it fails
 
-        # Add complete log handler if it was successfully created
-        if self._complete_log_handler:
-            logger.addHandler(self._complete_log_handler)
-
-        # Add severity-specific handlers
-        for handler in self._severity_handlers.values():
-            logger.addHandler(handler)
+        # Route this logger's records: complete log + severity handlers are shared by all loggers
+        shared = [self._complete_log_handler] if self._complete_log_handler else []
+        shared.extend(self._severity_handlers.values())
+        self._router.shared = shared
+        self._router.routes[logger_name] = file_handlers
+        queue_handler = RecordQueueHandler(self._queue, logger_name)
+        queue_handler._httpx_marker = True
+        logger.addHandler(queue_handler)
+        self._start_listener()
 
         # Store in registry
         self._logger_instances[logger_name] = logger
@@ -366,17 +539,35 @@ class Logger:
             if logger_name in self._logger_instances:
                 logger = self._logger_instances[logger_name]
                 for handler in logger.handlers[:]:  # Copy list to avoid modification during iteration
-                    handler.close()
                     logger.removeHandler(handler)
+                    handler.close()
+
+                # Drain records already queued for this logger before closing its file handlers
+                listener_running = self._listener is not None
+                self._stop_listener()
+                for handler in self._router.routes.pop(logger_name, ()):
+                    handler.close()
+                for handler in self._router.shared:
+                    handler.flush()
+                if listener_running and self._router.routes:
+                    self._start_listener()
                 del self._logger_instances[logger_name]
         else:
             # Close all loggers
             for name, logger in list(self._logger_instances.items()):
                 for handler in logger.handlers[:]:
-                    handler.close()
                     logger.removeHandler(handler)
+                    handler.close()
             self._logger_instances.clear()
 
+            # Stop the listener (flushes anything still queued), then close file handlers
+            self._stop_listener()
+            for handlers in self._router.routes.values():
+                for handler in handlers:
+                    handler.close()
+            self._router.routes.clear()
+            self._router.shared = []
+
             # Close shared handlers
             if self._complete_log_handler:
                 self._complete_log_handler.close()
@@ -388,46 +579,34 @@ class Logger:
 
     def close_all_loggers(self):
         """Close all loggers and handlers - alias for close_logger()"""
-        for instance in self.list_loggers():
-            self.close_logger(instance)
+        self.close_logger()
 
     def list_loggers(self):
         """Return list of active logger names"""
         return list(self._logger_instances.keys())
 
     def _get_caller_class_name(self) -> str:
-        """Automatically detect the calling class name using inspect"""
-        frame = None
+        """Automatically detect the calling class name from the caller's frame"""
         try:
-            # Get the call stack
-            frame = inspect.currentframe()
-            # Go back 2 frames: 1 for create_logger, 1 for the caller
-            for i in range(2):
-                if frame:
-                    frame = frame.f_back
-
-            # Look for the 'self' parameter in the caller's frame
-            if frame and 'self' in frame.f_locals:
-                instance = frame.f_locals['self']
-                return instance.__class__.__name__
-
-            # If no 'self' found, try to get from the class definition
-            if frame and 'cls' in frame.f_locals:
-                cls = frame.f_locals['cls']
-                return cls.__name__
-
-        except (AttributeError, KeyError, IndexError):
-            pass
+            # Skip 2 frames: 1 for this method, 1 for create_logger
+            frame = sys._getframe(2)
+        except (AttributeError, ValueError):
+            # sys._getframe is CPython-specific
+            return "unknown_logger"
+
+        f_locals = frame.f_locals
+        # Look for the 'self' parameter in the caller's frame
+        instance = f_locals.get('self')
+        if instance is not None:
+            return type(instance).__name__
+
+        # If no 'self' found, try to get from the class definition
+        cls = f_locals.get('cls')
+        if isinstance(cls, type):
+            return cls.__name__
 
         # Fallback to the function name if class detection fails
-
-        try:
-            if frame:
-                return frame.f_code.co_name
-        except:
-            pass
-
-        return "unknown_logger"
+        return frame.f_code.co_name
 
     def create_logger(self, logging_level: str = "DEBUG", **kwargs):
         """Factory function to create logger with customizable options"""